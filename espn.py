@@ -16,13 +16,49 @@ Optional parameters:
     2. Stat type: weekly stats or season leaders. Different formats, so can
         only request either one.
         
-This module relies on pandas module for reading the html tables, and creating
-    the data manipulation for dataframes.
+This module relies on requests and a thread pool for fetching the ESPN
+    webpages concurrently over pooled connections, caching the webpages to
+    disk so repeat requests skip ESPN entirely, precompiled regular
+    expressions for scanning the templated html tables, and pandas module for
+    creating the data manipulation for dataframes. Saving to Parquet with
+    Qbr.to_parquet also requires pyarrow.
 
 @author: cwhaley. 2021-02-17
 """
 
-import pandas as pd    # reading ESPN webpages, creating dataframes
+import datetime        # deciding whether cached seasons are final
+import functools       # memoizing season identifiers
+import hashlib         # cache file names for ESPN webpages
+import itertools       # stopping the table scan early
+import os              # cache directory for ESPN webpages
+import re              # scanning ESPN html tables
+import tempfile        # atomic writes to the webpage cache
+import time            # age of cached ESPN webpages
+from collections import deque   # window of pending webpage fetches
+from concurrent.futures import ThreadPoolExecutor   # fetching ESPN webpages concurrently
+from html import unescape   # decoding html entities in table cells
+
+import numpy as np     # input normalization
+import pandas as pd    # creating dataframes
+import requests        # http session for ESPN webpages
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# ESPN's QBR webpages are templated, so their tables can be scanned linearly
+_TABLE_RE = re.compile(r'<table\b[^>]*>(.*?)</table>', re.DOTALL)
+_ROW_RE = re.compile(r'<tr\b[^>]*>(.*?)</tr>', re.DOTALL)
+_CELL_RE = re.compile(r'<(t[hd])\b[^>]*>(.*?)</\1>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+@functools.lru_cache(maxsize=8)
+def _season_ids(season_type):
+    """
+    ESPN url identifiers for a season type, computed once per season type.
+    Raises KeyError for unknown season types.
+    """
+    return {'regular': (2,), 'postseason': (3,), 'all': (2, 3)}[season_type]
 
 
 
@@ -30,14 +66,41 @@ class Qbr:
     """
     Load ESPN's QBR data from their website. Able to get regular season or
     postseason, weekly stats or season leaders.
+    
+    Webpages are cached to disk only when cache_dir is given, e.g.
+    Qbr(2020, cache_dir='espn_qbr_cache'). Finished seasons are kept for good,
+    the ongoing season is fetched again after CACHE_EXPIRE_AFTER seconds.
     """
     
-    def __init__(self, years, weeks=1, season_type='regular', stat_type='weekly'):
+    # seconds before a cached webpage for an ongoing season is fetched again
+    CACHE_EXPIRE_AFTER = 86400
+    
+    # webpages fetched at once, and the most fetched ahead of a caller
+    # streaming weekly stats
+    FETCH_WORKERS = 12
+    
+    # loader for each stat type
+    _DISPATCH = {
+        'weekly': lambda s: s.load_weekly_qbr(s.years, s.weeks, s.season_type),
+        'leaders': lambda s: s.load_season_leaders_qbr(s.years, s.season_type),
+        }
+    
+    def __init__(self, years, weeks=1, season_type='regular', stat_type='weekly',
+                 cache_dir=None):
          """ Initialize attributes to describe QBR stats from seasons and weeks."""
          self.years = years
          self.weeks = weeks
          self.season_type = season_type.lower().strip()
          self.stat_type = stat_type.lower().strip()
+         
+         # directory for cached webpages, or None to always fetch from ESPN
+         self.cache_dir = cache_dir
+         
+         # keep connections to ESPN alive between requests
+         self._session = requests.Session()
+         adapter = HTTPAdapter(pool_connections=1, pool_maxsize=20,
+                               max_retries=Retry(total=3, backoff_factor=0.3))
+         self._session.mount("https://", adapter)
         
         
     def load_qbr(self):
@@ -55,144 +118,470 @@ class Qbr:
             
         Returns
         -------
-        Dataframe of quarterbacks and their repsective QBR stats.
+        Dataframe of quarterbacks and their repsective QBR stats. Float stat
+        columns are float32 and integer stat columns the smallest integer
+        type that fits (e.g. int8 for RK), see _downcast_numeric.
         """
-                
-        # convert season values to url identifiers
-        self.season_type = self.convert_season_identifiers(self.season_type)
+        # Stat Type: Return weekly or season leaders stats
+        try:
+            loader = self._DISPATCH[self.stat_type]
+        except KeyError:
+            raise ValueError("Please enter an appropriate choice for stat types: "
+                             "weekly or leaders.") from None
         
-        # if years entered is not integer or list of integers, throw exception
-        self.years = self.convert_to_list(self.years)
-        self.weeks = self.convert_to_list(self.weeks)
+        return loader(self)
 
-         
-        # Stat Type: Return weekly or season leaders stats, or both
-        if self.stat_type == 'weekly':
-           final_df = self.load_weekly_qbr(self.years, self.weeks, self.season_type)
+
+    def to_parquet(self, path):
+        """
+        Load QBR stats and save them to a Parquet file, so later analysis can
+        read them back, or just the columns needed, without fetching ESPN.
+        Requires pyarrow.
         
-        elif self.stat_type == 'leaders':
-            final_df = self.load_season_leaders_qbr(self.years, self.season_type)
+        Parameters
+        ----------
+        path : string
+            file path for the Parquet file.
             
-        else:
-            print("Please enter an appropriate choice for stat types: "
-                  "weekly or leaders.")
+        Returns
+        -------
+        None.
+        """
+        final_df = self.load_qbr()
         
-        return final_df
+        # load_qbr returns an empty list when there is no data
+        if not isinstance(final_df, pd.DataFrame):
+            raise ValueError("No data to write.")
+        
+        final_df.to_parquet(path, engine='pyarrow', compression='zstd')
 
 
-    def load_weekly_qbr(self, years, weeks, season_type):
+    def load_weekly_qbr(self, years=None, weeks=None, season_type=None):
         """
         Parameters
         ----------
         years : int or list
-            years for seasons.
+            years for seasons. Defaults to this Qbr's years.
         weeks : int or list
-            weeks of the season.
+            weeks of the season. Defaults to this Qbr's weeks.
         season_type : string
-            regular, postseason, or all seasons.
+            regular, postseason, or all seasons. Defaults to this Qbr's
+            season type.
             
         Returns
         -------
         Dataframes of quarterbacks and repsective QBR stats.
         """
-        # initialize empty dataframe
-        df = []
+        frames = list(self.iter_weekly_qbr(years, weeks, season_type))
         
-        # Loop through season type-year-month        
-        try:
-            for season_id in season_type:
-                for year in years:
-                    for week in weeks:
-                        # no postseason week 4, so skip
-                        if season_id == 3 and week == 4:
-                            continue
-                        else:
-                            # pull data by season
-                            url = f"https://www.espn.com/nfl/qbr/_/view/weekly/season/{year}/seasontype/{season_id}/week/{week}"
-                
-                            # webpage has 2 tables: one for QB, other for stats
-                            dfs = pd.read_html(url)
-                
-                            # join both dataframes together by binding columns
-                            stg_df = pd.concat(dfs, axis=1)
-                    
-                            # add a column for the year
-                            stg_df['year'] = year
-                            
-                            # add column for season_type
-                            stg_df['season_type'] = season_id
-                            stg_df['season_type'] = ['regular' if x == 2 else 'postseason' for x in stg_df['season_type']]
-                    
-                            # append to other weeks
-                            df.append(stg_df)
-        except ImportError:
-            print("No data to output. Check variables entered. "
-                  "Note: there is no 'Week 4' webpage for postseason stats. "
-                  "It is skipped, with Week 3 as Conference Championships, and "
-                  "Week 5 as the Super Bowl.")
+        # every webpage was missing, nothing to row bind
+        if not frames:
+            print("No data to output.")
+            return []
+        
+        # row bind all years, weeks data together. frames are already compact
+        # and concat keeps their dtypes
+        weekly_df = pd.concat(frames, axis=0, ignore_index=True, sort=False)
+        
+        # a column missing from some weeks is filled with NaN, narrow it again
+        weekly_df = self._downcast_numeric(weekly_df)
+        
+        return weekly_df
+        
+    
+    def iter_weekly_qbr(self, years=None, weeks=None, season_type=None):
+        """
+        Generate weekly QBR stats one webpage at a time, so callers can stop
+        early or aggregate without holding every week in memory. Only
+        FETCH_WORKERS webpages are fetched ahead of the caller. Inputs are
+        checked when called, before any webpage is fetched.
+        
+        Parameters
+        ----------
+        years : int or list
+            years for seasons. Defaults to this Qbr's years.
+        weeks : int or list
+            weeks of the season. Defaults to this Qbr's weeks.
+        season_type : string
+            regular, postseason, or all seasons. Defaults to this Qbr's
+            season type.
             
-        except TypeError:
-            print("Please enter valid parameters.")
+        Returns
+        -------
+        Generator of dataframes of quarterbacks and repsective QBR stats,
+        one per season type-year-week, with the same compact dtypes as
+        load_weekly_qbr.
+        """
+        years, weeks, season_ids = self._validated_inputs(years, weeks, season_type)
         
-        # row bind all years, weeks data together    
-        try:
-            weekly_df = pd.concat(df, ignore_index=True)
+        return self._iter_weekly_pages(years, weeks, season_ids)
+    
+    
+    def _iter_weekly_pages(self, years, weeks, season_ids):
+        """
+        Parameters
+        ----------
+        years : list of integers
+            years for seasons.
+        weeks : list of integers
+            weeks of the season.
+        season_ids : tuple of integers
+            ESPN url identifiers for the season types.
             
-        # Raise exception when final dataframe is empty
-        except ValueError:
-            print("No data to output.")
-            weekly_df = []
+        Yields
+        ------
+        Dataframe of quarterbacks and repsective QBR stats for one
+        season type-year-week.
+        """
+        # build every season type-year-week url up front.
+        # no postseason week 4, so skip
+        jobs = [(season_id, year, week,
+                 f"https://www.espn.com/nfl/qbr/_/view/weekly/season/{year}/seasontype/{season_id}/week/{week}")
+                for season_id in season_ids
+                for year in years
+                for week in weeks
+                if not (season_id == 3 and week == 4)]
         
-        return weekly_df
+        # fetch all webpages at once
+        htmls = self._fetch_all([job[3] for job in jobs], [job[1] for job in jobs])
+        
+        for (season_id, year, week, url), html in zip(jobs, htmls):
+            # webpage not found on ESPN, skip it
+            if html is None:
+                continue
+            
+            # webpage has 2 tables: one for QB, other for stats, read as one
+            stg_df = self._read_tables(html)
+            if stg_df is None:
+                continue
+    
+            # add a column for the year
+            stg_df['year'] = year
+            
+            # add column for season_type, broadcast from the loop's scalar label
+            stg_df['season_type'] = 'regular' if season_id == 2 else 'postseason'
+            
+            # few distinct values, so store compactly. done per webpage so
+            # streamed frames match the dtypes of load_weekly_qbr
+            stg_df['season_type'] = stg_df['season_type'].astype(
+                pd.CategoricalDtype(['regular', 'postseason']))
+            stg_df['year'] = stg_df['year'].astype('int16')
+            stg_df = self._downcast_numeric(stg_df)
+    
+            yield stg_df
         
     
-    def load_season_leaders_qbr(self, years, season_type):
+    def load_season_leaders_qbr(self, years=None, season_type=None):
         """
         Parameters
         ----------
         years : integer or list of integers
-            Years for seasons.
+            Years for seasons. Defaults to this Qbr's years.
         season_type : string
-            'regular', 'postseason', or 'all'.
+            'regular', 'postseason', or 'all'. Defaults to this Qbr's
+            season type.
             
         Returns
         -------
         Dataframes of quarterbacks and repsective QBR stats.
         """
-        # initialize empty dataframe
-        df = []
+        years, _, season_ids = self._validated_inputs(years, self.weeks, season_type)
         
-        try:
-            for season_id in season_type:
-                for year in years:
-                    # pull data by season
-                    url = f"https://www.espn.com/nfl/qbr/_/season/{year}/seasontype/{season_id}"
+        # initialize empty list of dataframes
+        frames = []
+        
+        # build every season type-year url up front
+        jobs = [(season_id, year,
+                 f"https://www.espn.com/nfl/qbr/_/season/{year}/seasontype/{season_id}")
+                for season_id in season_ids
+                for year in years]
         
-                    # webpage has 2 tables: one for QB, other for stats
-                    dfs = pd.read_html(url)
+        # fetch all webpages at once
+        htmls = self._fetch_all([job[2] for job in jobs], [job[1] for job in jobs])
         
-                    # join both dataframes together by binding columns
-                    stg_df = pd.concat(dfs, axis=1)
+        for (season_id, year, url), html in zip(jobs, htmls):
+            # webpage not found on ESPN, skip it
+            if html is None:
+                continue
             
-                    # add a column for the year
-                    stg_df['year'] = year
+            # webpage has 2 tables: one for QB, other for stats, read as one
+            stg_df = self._read_tables(html)
+            if stg_df is None:
+                continue
+    
+            # add a column for the year
+            stg_df['year'] = year
+    
+            # append to other years
+            frames.append(stg_df)
             
-                    # append to other weeks
-                    df.append(stg_df)
-        except ValueError:
-            print("No tables found.")
-            leaders_df = []
+        # every webpage was missing, nothing to row bind
+        if not frames:
+            print("No data to output.")
+            return []
+        
+        # row bind all years data together
+        leaders_df = pd.concat(frames, axis=0, ignore_index=True, sort=False)
+        
+        # few distinct values, so store compactly
+        leaders_df['year'] = leaders_df['year'].astype('int16')
+        leaders_df = self._downcast_numeric(leaders_df)
+            
+        return leaders_df
+    
+    
+    def _validated_inputs(self, years=None, weeks=None, season_type=None):
+        """
+        Check and convert years, weeks and season type, defaulting to this
+        Qbr's.
+        
+        Parameters
+        ----------
+        years : int or list
+            years for seasons.
+        weeks : int or list
+            weeks of the season.
+        season_type : string
+            regular, postseason, or all seasons.
+            
+        Returns
+        -------
+        Tuple of years list, weeks list, and season identifiers tuple.
+        """
+        years = self.years if years is None else years
+        weeks = self.weeks if weeks is None else weeks
+        season_type = self.season_type if season_type is None else season_type
+        if isinstance(season_type, str):
+            season_type = season_type.lower().strip()
+        
+        # convert season values to url identifiers, throws exception if invalid
+        season_ids = self.convert_season_identifiers(season_type)
+        
+        # if years entered is not integer or list of integers, throw exception
+        years = self.convert_to_list(years)
+        weeks = self.convert_to_list(weeks)
+        if years is None or weeks is None:
+            raise TypeError("Please enter an integer or list of integers for "
+                            "years and weeks.")
+        
+        return years, weeks, season_ids
+    
+    
+    def _fetch_all(self, urls, years):
+        """
+        Fetch ESPN webpages concurrently over the pooled http session.
+        
+        Parameters
+        ----------
+        urls : list of strings
+            ESPN QBR webpages to request.
+        years : list of integers
+            season year of each url, used for caching.
             
-        # row bind all years, weeks data together.     
+        Yields
+        ------
+        html strings, in the same order as urls. Webpages ESPN doesn't
+        have are None.
+        """
+        # network reads release the GIL, so threads overlap the round trips.
+        # pool size caps the number of requests in flight to be polite to ESPN
+        executor = ThreadPoolExecutor(max_workers=self.FETCH_WORKERS)
+        jobs = zip(urls, years)
+        
+        # submit through a window of at most FETCH_WORKERS pending webpages,
+        # refilled as each is yielded, so a caller that stops early or reads
+        # slowly doesn't fetch and hold every webpage
+        pending = deque(executor.submit(self._get_html, url, year)
+                        for url, year in itertools.islice(jobs, self.FETCH_WORKERS))
         try:
-            leaders_df = pd.concat(df, ignore_index=True)
+            while pending:
+                html = pending.popleft().result()
+                for url, year in itertools.islice(jobs, 1):
+                    pending.append(executor.submit(self._get_html, url, year))
+                yield html
+        finally:
+            # stop fetching remaining webpages if the caller stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    
+    def _get_html(self, url, year):
+        """
+        Get an ESPN webpage, from the disk cache when available.
         
-        # Raise exception when final dataframe is empty
-        except ValueError:
-            print("No data to output.")
-            leaders_df = []
+        Parameters
+        ----------
+        url : string
+            ESPN QBR webpage to request.
+        year : integer
+            season year of the webpage. Finished seasons never change, so
+            their cached webpages never expire.
             
-        return leaders_df
+        Returns
+        -------
+        html string of the webpage, or None if ESPN has no such webpage.
+        """
+        if self.cache_dir is not None:
+            # cache files are named by the hash of their url
+            path = os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.html')
+            
+            # NFL postseason finishes in February of the following year
+            today = datetime.date.today()
+            final_season = year < today.year - 1 or (year == today.year - 1 and today.month > 2)
+            
+            if os.path.exists(path) and (final_season or
+                    time.time() - os.path.getmtime(path) < self.CACHE_EXPIRE_AFTER):
+                with open(path, encoding='utf-8') as f:
+                    return f.read()
+        
+        response = self._session.get(url, timeout=10)
+        
+        # a single missing webpage shouldn't abort the whole request
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            if response.status_code == 404:
+                return None
+            raise
+        
+        # decode the body once, encoding detection can run on every access
+        html = response.text
+        
+        # only cache complete webpages, so error or bot-block pages are
+        # fetched again next time instead of being kept for good
+        if self.cache_dir is not None and len(self._find_tables(html)) == 2:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # write to a temporary file first so a partial write is never read
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(html)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        
+        return html
+    
+    
+    def _find_tables(self, html):
+        """
+        Find the QB and stats tables on an ESPN QBR webpage.
+        
+        Parameters
+        ----------
+        html : string
+            html of an ESPN QBR webpage.
+            
+        Returns
+        -------
+        List of the inner html of up to the first 2 tables.
+        """
+        # the QB and stats tables come first, so stop scanning after them
+        # rather than matching every table further down the webpage
+        return [match.group(1) for match in itertools.islice(_TABLE_RE.finditer(html), 2)]
+    
+    
+    def _read_tables(self, html):
+        """
+        Parse the QB and stats tables from an ESPN QBR webpage in one pass,
+        binding their columns together.
+        
+        Parameters
+        ----------
+        html : string
+            html of an ESPN QBR webpage.
+            
+        Returns
+        -------
+        Dataframe of the QB table's columns followed by the stats table's
+        columns, or None if the webpage doesn't have both tables.
+        """
+        tables = self._find_tables(html)
+        if len(tables) < 2:
+            return None
+        
+        # column names come from the header row, values from the body rows.
+        # a row with only <th> cells is the header, any <td> makes it data
+        header = []
+        rows = None
+        for table in tables:
+            table_header = []
+            table_rows = []
+            for row in _ROW_RE.findall(table):
+                cells = _CELL_RE.findall(row)
+                if any(tag == 'td' for tag, _ in cells):
+                    table_rows.append([self._cell_text(cell) for _, cell in cells])
+                elif cells:
+                    table_header = [self._cell_text(cell) for _, cell in cells]
+            
+            # both tables have one row per QB in the same order, so rows are
+            # joined before building a single dataframe
+            if rows is not None and len(rows) != len(table_rows):
+                raise ValueError(f"QB table has {len(rows)} rows but stats table "
+                                 f"has {len(table_rows)} rows.")
+            
+            header += table_header
+            rows = table_rows if rows is None else [a + b for a, b in zip(rows, table_rows)]
+        
+        stg_df = pd.DataFrame(rows, columns=header)
+        
+        # numeric stats arrive as text with thousands separators, convert
+        # where possible
+        # by position, since both tables can share a column name
+        for i in range(stg_df.shape[1]):
+            try:
+                stg_df.isetitem(i, pd.to_numeric(stg_df.iloc[:, i].str.replace(',', '', regex=False)))
+            except ValueError:
+                pass
+        
+        return stg_df
+    
+    
+    def _downcast_numeric(self, df):
+        """
+        Narrow numeric stat columns to halve their memory. float32 holds
+        about 7 significant digits, so one-decimal ESPN stats show float32
+        rounding when printed or converted to Python floats, e.g. a QBR of
+        85.3 prints as 85.300003; use astype('float64').round(1) before
+        display or export.
+        Integer columns such as RK and PLAYS can become int8 or int16, so
+        cast them with astype('int64') before arithmetic that may overflow.
+        
+        Parameters
+        ----------
+        df : dataframe
+            QBR stats.
+            
+        Returns
+        -------
+        Dataframe with float32 float columns and the smallest integer type
+        that fits each integer column.
+        """
+        # by position, since column names can repeat across the two tables
+        for i, dtype in enumerate(df.dtypes):
+            if dtype == 'float64':
+                df.isetitem(i, df.iloc[:, i].astype('float32'))
+            elif pd.api.types.is_integer_dtype(dtype):
+                df.isetitem(i, pd.to_numeric(df.iloc[:, i], downcast='integer'))
+        
+        return df
+    
+    
+    def _cell_text(self, cell):
+        """
+        Text of an html table cell, without tags or entities.
+        
+        Parameters
+        ----------
+        cell : string
+            inner html of a table cell.
+            
+        Returns
+        -------
+        String of the cell's text.
+        """
+        return unescape(_TAG_RE.sub('', cell)).strip()
     
     
     def convert_season_identifiers(self, season_type):
@@ -208,26 +597,17 @@ class Qbr:
             
         Returns
         -------
-        List of identifiers for data requested.
-            regular identifier: [2]
-            postseason identifier: [3]
-            all: [2,3]
+        Tuple of identifiers for data requested.
+            regular identifier: (2,)
+            postseason identifier: (3,)
+            all: (2, 3)
         """
         # Create url identifiers based on seasons requested
-        if self.season_type == 'regular':
-            season_espn_identifiers = [2]
-         
-        elif self.season_type == 'postseason':
-            season_espn_identifiers = [3]
-        
-        elif self.season_type == 'all':
-            season_espn_identifiers = [2,3]
-        
-        else:
-            season_espn_identifiers = print("Please enter either: 'regular', "
-                                            "'postseason', or 'all'.")
-
-        return season_espn_identifiers
+        try:
+            return _season_ids(season_type)
+        except (KeyError, TypeError):
+            raise ValueError("Please enter either: 'regular', "
+                             "'postseason', or 'all'.") from None
 
     
     def convert_to_list(self, weeks_or_years):
@@ -235,7 +615,7 @@ class Qbr:
         Take user input of interger or list of integers, converts to list.
         Parameters
         ----------
-        weeks_or_years : int, list
+        weeks_or_years : int, list or tuple
             Takes input of weeks or years for seasons, 
             and adds values to a list to be used in loops.
             
@@ -243,25 +623,20 @@ class Qbr:
         -------
         List of weeks or years for seasons of data requested.
         """
-        # initialize an empty list
-        out_list = []
-        
-        # if one number entered, verify variable is an int. if so, append to empty list
-        if isinstance(weeks_or_years, int):
-            out_list.append(weeks_or_years)
-        
-        # if list, check to see that all elements are integers.
-        elif isinstance(weeks_or_years, list):
-            out_list = weeks_or_years[:]
-            for num in out_list:
-                if not isinstance(num,int):
-                    return None
-                
-        # neither integer or list of integers, give user feedback.            
-        else:
+        # bools count as integers to Python and to numpy when mixed with ints,
+        # but are never valid weeks or years
+        values = weeks_or_years if isinstance(weeks_or_years, (list, tuple)) else [weeks_or_years]
+        if any(isinstance(value, (bool, np.bool_)) for value in values):
             return None
         
-        return out_list
+        # numpy checks and normalizes the element types in one pass
+        try:
+            arr = np.atleast_1d(np.asarray(weeks_or_years))
+        except ValueError:
+            return None
         
-    
-  
\ No newline at end of file
+        # neither integer or list of integers, give user feedback.
+        if arr.ndim != 1 or (arr.size and arr.dtype.kind not in 'iu'):
+            return None
+        
+        return arr.astype(np.int64).tolist()
@@ -8,11 +8,13 @@ Weeks: integer or list of integers of available years. Currently, 1-17, for
         years 2006-2020.
 Season_type: string. 'regular', 'postseason', or 'all'.
 Stat_type: string. 'weekly' or 'leaders' (i.e., season leaders).
+Cache_dir: string. folder for cached ESPN webpages, None to not cache.
       
 @author: cwhaley. 2021-02-17
 """
 # Load packages
 from espn import Qbr
+import pandas as pd
 import sys
 
 # add folder to path list for python to look for module
@@ -23,40 +25,45 @@ for path in sys.path:
     print(path)
 
 
+# cache fetched webpages here, so running the script again reads them from
+# disk instead of ESPN
+cache_dir = 'espn_qbr_cache'
+
+
 #---- Weekly Stats
 #-- Regular Season
 # 1 year, 1 week
-df = Qbr(years=2020, weeks=1)
+df = Qbr(years=2020, weeks=1, cache_dir=cache_dir)
 df1 = df.load_qbr()
     
 # 1 year, multiple weeks 
-df2 = Qbr(years=2020, weeks=[1,2])
+df2 = Qbr(years=2020, weeks=[1,2], cache_dir=cache_dir)
 df3 = df2.load_qbr()
 
 # multiple years, 1 week
-df4 = Qbr(years=[2019,2020], weeks=1)
+df4 = Qbr(years=[2019,2020], weeks=1, cache_dir=cache_dir)
 df5 = df4.load_qbr()
 
 # multiple years, multiple weeks
-df6 = Qbr(years=[2019, 2020], weeks=[1,2])
+df6 = Qbr(years=[2019, 2020], weeks=[1,2], cache_dir=cache_dir)
 df7 = df6.load_qbr()
 
 
 #-- Postseason
 # 1 year, 1 week
-df8 = Qbr(years=2020, weeks=1, season_type='postseason')
+df8 = Qbr(years=2020, weeks=1, season_type='postseason', cache_dir=cache_dir)
 df9 = df8.load_qbr()
     
 # 1 year, multiple weeks 
-df10 = Qbr(years=2020, weeks=[1,2], season_type='postseason')
+df10 = Qbr(years=2020, weeks=[1,2], season_type='postseason', cache_dir=cache_dir)
 df11 = df10.load_qbr()
 
 # multiple years, 1 week
-df12 = Qbr(years=[2019,2020], weeks=1, season_type='postseason')
+df12 = Qbr(years=[2019,2020], weeks=1, season_type='postseason', cache_dir=cache_dir)
 df13 = df12.load_qbr()
 
 # multiple years, multiple weeks
-df14 = Qbr(years=[2019, 2020], weeks=[1,2], season_type='postseason')
+df14 = Qbr(years=[2019, 2020], weeks=[1,2], season_type='postseason', cache_dir=cache_dir)
 df15 = df14.load_qbr()
 
 
@@ -65,24 +72,38 @@ df15 = df14.load_qbr()
 #---- Season Leaders
 #-- Regular Season
 # 1 year
-df16 = Qbr(years=2020, weeks=1, stat_type='leaders')
+df16 = Qbr(years=2020, weeks=1, stat_type='leaders', cache_dir=cache_dir)
 df17 = df16.load_qbr()
     
 # multiple years
-df18 = Qbr(years=[2019,2020], weeks=1, stat_type='leaders')
+df18 = Qbr(years=[2019,2020], weeks=1, stat_type='leaders', cache_dir=cache_dir)
 df19 = df18.load_qbr()
 
 
 #-- Postseason
 # 1 year
-df20 = Qbr(years=2020, weeks=1, season_type='postseason', stat_type='leaders')
+df20 = Qbr(years=2020, weeks=1, season_type='postseason', stat_type='leaders', cache_dir=cache_dir)
 df21 = df20.load_qbr()
     
 # multiple years 
-df22 = Qbr(years=[2019,2020], weeks=1, season_type='postseason', stat_type='leaders')
+df22 = Qbr(years=[2019,2020], weeks=1, season_type='postseason', stat_type='leaders', cache_dir=cache_dir)
 df23 = df22.load_qbr()
 
 
+#---- Streaming weekly stats
+# one dataframe per week. stopping after the first only fetches the few
+# webpages already queued ahead of it, not the rest of the seasons
+df24 = Qbr(years=[2019, 2020], weeks=list(range(1, 18)), cache_dir=cache_dir)
+df25 = next(df24.iter_weekly_qbr()).head(5)
+
+
+#---- Save to Parquet (requires pyarrow)
+# save once, then read back only the columns needed without fetching ESPN
+df26 = Qbr(years=[2019, 2020], weeks=[1,2], season_type='all', cache_dir=cache_dir)
+df26.to_parquet('qbr_weekly.parquet')
+df27 = pd.read_parquet('qbr_weekly.parquet', columns=['NAME', 'QBR', 'year'])
+
+
 
 
 
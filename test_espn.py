@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for parsing ESPN QBR webpages with the espn module, using fixture html
+shaped like ESPN's two-table layout.
+"""
+
+import datetime
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from espn import Qbr
+
+
+QB_TABLE = """
+<table class="Table Table--align-right Table--fixed Table--fixed-left">
+  <thead><tr class="Table__sub-header"><th>RK</th><th>NAME</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td><a href="/nfl/player">Aaron Rodgers</a><span>GB</span></td></tr>
+    <tr><td>2</td><td><a href="/nfl/player">Josh Allen</a><span>BUF</span></td></tr>
+  </tbody>
+</table>
+"""
+
+STATS_TABLE = """
+<table class="Table Table--align-right">
+  <thead><tr><th><a title="Total QBR">QBR</a></th><th>PAA</th><th>PLAYS</th></tr></thead>
+  <tbody>
+    <tr><td>84.4</td><td>52.6</td><td>1,034</td></tr>
+    <tr><td>81.7</td><td>48.4</td><td>&nbsp;812</td></tr>
+  </tbody>
+</table>
+"""
+
+
+def make_page(*tables):
+    return "<html><body><nav>menu</nav>" + "".join(tables) + "</body></html>"
+
+
+def test_read_tables_joins_qb_and_stats_columns():
+    df = Qbr(2020)._read_tables(make_page(QB_TABLE, STATS_TABLE))
+
+    assert list(df.columns) == ['RK', 'NAME', 'QBR', 'PAA', 'PLAYS']
+    assert df['NAME'].tolist() == ['Aaron RodgersGB', 'Josh AllenBUF']
+    assert df['QBR'].tolist() == [84.4, 81.7]
+
+
+def test_read_tables_converts_numeric_columns():
+    df = Qbr(2020)._read_tables(make_page(QB_TABLE, STATS_TABLE))
+
+    assert pd.api.types.is_integer_dtype(df['RK'])
+    assert pd.api.types.is_float_dtype(df['QBR'])
+    assert pd.api.types.is_integer_dtype(df['PLAYS'])
+    assert df['PLAYS'].tolist() == [1034, 812]
+    assert not pd.api.types.is_numeric_dtype(df['NAME'])
+
+
+def test_read_tables_treats_mixed_header_and_data_cells_as_data():
+    qb_table = QB_TABLE.replace("<tr><td>2</td>", "<tr><th>2</th>")
+    df = Qbr(2020)._read_tables(make_page(qb_table, STATS_TABLE))
+
+    assert list(df.columns) == ['RK', 'NAME', 'QBR', 'PAA', 'PLAYS']
+    assert df['RK'].tolist() == [1, 2]
+
+
+def test_read_tables_raises_on_mismatched_row_counts():
+    stats_table = STATS_TABLE.replace("<tr><td>81.7</td><td>48.4</td><td>&nbsp;812</td></tr>", "")
+
+    with pytest.raises(ValueError, match="2 rows but stats table has 1 rows"):
+        Qbr(2020)._read_tables(make_page(QB_TABLE, stats_table))
+
+
+def test_read_tables_returns_none_without_both_tables():
+    assert Qbr(2020)._read_tables(make_page(QB_TABLE)) is None
+
+
+def stub_pages(qbr, pages):
+    """ Serve fixture html by url instead of fetching ESPN. """
+    qbr._get_html = lambda url, year: pages.get(url)
+    return qbr
+
+
+def weekly_url(year, season_id, week):
+    return f"https://www.espn.com/nfl/qbr/_/view/weekly/season/{year}/seasontype/{season_id}/week/{week}"
+
+
+def test_iter_weekly_qbr_converts_instance_inputs():
+    qbr = stub_pages(Qbr(years=2020, weeks=[1, 2]),
+                     {weekly_url(2020, 2, 1): make_page(QB_TABLE, STATS_TABLE)})
+
+    frames = list(qbr.iter_weekly_qbr())
+
+    # week 2 is missing and skipped
+    assert len(frames) == 1
+    assert frames[0]['year'].unique().tolist() == [2020]
+    assert frames[0]['season_type'].unique().tolist() == ['regular']
+
+
+def test_iter_weekly_qbr_validates_before_fetching():
+    with pytest.raises(ValueError):
+        Qbr(years=2020, weeks=1, season_type='preseason').iter_weekly_qbr()
+    with pytest.raises(TypeError):
+        Qbr(years='2020', weeks=1).iter_weekly_qbr()
+
+
+def test_load_qbr_weekly_row_binds_pages():
+    page = make_page(QB_TABLE, STATS_TABLE)
+    qbr = stub_pages(Qbr(years=[2019, 2020], weeks=1, season_type='all'),
+                     {weekly_url(2019, 2, 1): page, weekly_url(2020, 3, 1): page})
+
+    df = qbr.load_qbr()
+
+    assert len(df) == 4
+    assert df['year'].tolist() == [2019, 2019, 2020, 2020]
+    assert df['season_type'].tolist() == ['regular', 'regular', 'postseason', 'postseason']
+    assert isinstance(df['season_type'].dtype, pd.CategoricalDtype)
+
+
+def test_load_weekly_qbr_raises_parse_errors():
+    bad_stats = STATS_TABLE.replace("<th>PLAYS</th>", "")
+    qbr = stub_pages(Qbr(years=2020, weeks=1),
+                     {weekly_url(2020, 2, 1): make_page(QB_TABLE, bad_stats)})
+
+    with pytest.raises(ValueError):
+        qbr.load_weekly_qbr()
+
+
+class StubResponse:
+    """ Stand-in for a requests response with a 200 status. """
+
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class StubSession:
+    """ Serve fixture html by url and count the requests made. """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = 0
+
+    def get(self, url, timeout):
+        self.calls += 1
+        return StubResponse(self.pages[url])
+
+
+def cached_qbr(tmp_path, pages):
+    qbr = Qbr(2020, cache_dir=str(tmp_path))
+    qbr._session = StubSession(pages)
+    return qbr
+
+
+def test_get_html_cache_hit_skips_request(tmp_path):
+    page = make_page(QB_TABLE, STATS_TABLE)
+    qbr = cached_qbr(tmp_path, {'https://qbr/2010': page})
+
+    assert qbr._get_html('https://qbr/2010', 2010) == page
+    assert qbr._get_html('https://qbr/2010', 2010) == page
+    assert qbr._session.calls == 1
+
+
+def test_get_html_does_not_cache_incomplete_pages(tmp_path):
+    page = make_page(QB_TABLE)
+    qbr = cached_qbr(tmp_path, {'https://qbr/2010': page})
+
+    assert qbr._get_html('https://qbr/2010', 2010) == page
+    assert qbr._get_html('https://qbr/2010', 2010) == page
+    assert qbr._session.calls == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_html_refetches_expired_current_season(tmp_path):
+    year = datetime.date.today().year
+    page = make_page(QB_TABLE, STATS_TABLE)
+    qbr = cached_qbr(tmp_path, {'https://qbr/current': page})
+
+    qbr._get_html('https://qbr/current', year)
+    qbr._get_html('https://qbr/current', year)
+    assert qbr._session.calls == 1
+
+    # age the cached webpage past its expiry
+    (cache_file,) = tmp_path.iterdir()
+    expired = time.time() - Qbr.CACHE_EXPIRE_AFTER - 1
+    os.utime(cache_file, (expired, expired))
+
+    updated = make_page(QB_TABLE, STATS_TABLE.replace("84.4", "85.0"))
+    qbr._session.pages['https://qbr/current'] = updated
+    assert qbr._get_html('https://qbr/current', year) == updated
+    assert qbr._session.calls == 2
+
+
+@pytest.mark.parametrize('weeks_or_years, expected', [
+    (2020, [2020]),
+    ([2019, 2020], [2019, 2020]),
+    ((2019, 2020), [2019, 2020]),
+    ([], []),
+    (1.5, None),
+    ([1, 1.5], None),
+    ('2020', None),
+    (['2019', '2020'], None),
+    (True, None),
+    ([1, True], None),
+    ])
+def test_convert_to_list(weeks_or_years, expected):
+    assert Qbr(2020).convert_to_list(weeks_or_years) == expected
+
+
+def test_convert_to_list_returns_python_ints():
+    assert all(type(year) is int for year in Qbr(2020).convert_to_list((2019, 2020)))
+
+
+def test_iter_weekly_qbr_frames_match_load_weekly_qbr_dtypes():
+    page = make_page(QB_TABLE, STATS_TABLE)
+    qbr = stub_pages(Qbr(years=2020, weeks=[1, 2]),
+                     {weekly_url(2020, 2, 1): page, weekly_url(2020, 2, 2): page})
+
+    streamed = pd.concat(list(qbr.iter_weekly_qbr()), ignore_index=True)
+    loaded = qbr.load_weekly_qbr()
+
+    assert streamed.dtypes.to_dict() == loaded.dtypes.to_dict()
+    assert isinstance(streamed['season_type'].dtype, pd.CategoricalDtype)
+    assert streamed['year'].dtype == 'int16'
+    assert streamed['QBR'].dtype == 'float32'
+
+
+def test_read_tables_converts_duplicate_column_names():
+    stats_table = STATS_TABLE.replace("<th>PAA</th>", "<th>RK</th>")
+    df = Qbr(2020)._read_tables(make_page(QB_TABLE, stats_table))
+
+    assert list(df.columns) == ['RK', 'NAME', 'QBR', 'RK', 'PLAYS']
+    numeric = [pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes]
+    assert numeric == [True, False, True, True, True]
+    assert df.iloc[:, 3].tolist() == [52.6, 48.4]
+
+
+def test_load_weekly_qbr_downcasts_duplicate_column_names_by_position():
+    stats_table = STATS_TABLE.replace("<th>PAA</th>", "<th>RK</th>")
+    qbr = stub_pages(Qbr(years=2020, weeks=1),
+                     {weekly_url(2020, 2, 1): make_page(QB_TABLE, stats_table)})
+
+    df = qbr.load_weekly_qbr()
+
+    assert df.iloc[:, 0].dtype == 'int8'
+    assert df.iloc[:, 3].dtype == 'float32'
+
+
+def test_iter_weekly_qbr_fetches_a_bounded_window_ahead():
+    page = make_page(QB_TABLE, STATS_TABLE)
+    qbr = Qbr(years=[2019, 2020], weeks=list(range(1, 18)))
+    fetched = []
+    lock = threading.Lock()
+
+    def get_html(url, year):
+        with lock:
+            fetched.append(url)
+        return page
+
+    qbr._get_html = get_html
+
+    frames = qbr.iter_weekly_qbr()
+    next(frames)
+    frames.close()
+
+    # the webpage read plus at most a full window of pending fetches
+    assert len(fetched) <= Qbr.FETCH_WORKERS + 1
+    assert len(fetched) < 34
+
+
+def test_loaders_accept_explicit_inputs():
+    page = make_page(QB_TABLE, STATS_TABLE)
+    leaders_url = "https://www.espn.com/nfl/qbr/_/season/2019/seasontype/3"
+    qbr = stub_pages(Qbr(years=2020, weeks=1),
+                     {weekly_url(2019, 3, 5): page, leaders_url: page})
+
+    weekly_df = qbr.load_weekly_qbr(2019, 5, 'Postseason')
+    leaders_df = qbr.load_season_leaders_qbr([2019], 'postseason')
+
+    assert weekly_df['year'].unique().tolist() == [2019]
+    assert weekly_df['season_type'].unique().tolist() == ['postseason']
+    assert leaders_df['year'].unique().tolist() == [2019]
+    with pytest.raises(ValueError):
+        qbr.load_weekly_qbr(2020, 1, [2])